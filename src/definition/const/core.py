@@ -1,7 +1,8 @@
 import os
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 from src.definition.const.location import ENV_FILE
 
@@ -13,5 +14,13 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise ValueError("环境变量 OPENAI_API_KEY 未设置")
 
+# 长连接保活的 HTTP 客户端，轮询 batch 状态时复用 TLS 连接；
+# 沿用 SDK 默认的超时与重定向设置，仅延长 keep-alive
+HTTP_CLIENT = DefaultHttpxClient(
+    limits=httpx.Limits(
+        max_connections=1000, max_keepalive_connections=100, keepalive_expiry=600.0
+    ),
+)
+
 # 初始化 OpenAI 客户端
-CLIENT = OpenAI(api_key=OPENAI_API_KEY)
+CLIENT = OpenAI(api_key=OPENAI_API_KEY, http_client=HTTP_CLIENT)
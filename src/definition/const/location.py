@@ -11,6 +11,7 @@ ENV_FILE = ROOT_DIR / ".env"
 
 # 2
 LOG_DIR = SRC_DIR / "log"
+IMG_CACHE_DIR = OUTPUT_DIR / ".img_cache"
 
 if __name__ == "__main__":
     print(ROOT_DIR)
@@ -3,6 +3,7 @@ from pathlib import Path
 from pipeline.task.pdf_to_jsonl import (
     gen_pdf_path,
     generate_jsonl_lines_from_pdf,
+    make_render_executor,
     write_jsonl_append,
 )
 from src.definition.const.location import INPUT_DIR, OUTPUT_DIR
@@ -14,10 +15,15 @@ async def pdf_to_jsonl_flow(
     model: str = "gpt-4o-mini",
     detail: str = "auto",
     output_dir: Path = OUTPUT_DIR,
+    render_workers: int = 4,
 ) -> None:
-    async for path in gen_pdf_path(pdf_dir):
-        path: Path
-        write_jsonl_append(
-            output_dir / path.with_suffix(".jsonl").name,
-            generate_jsonl_lines_from_pdf(path, prompt, model, detail),
-        )
+    # 渲染进程池在整个流程内共享，进程按需启动，全部命中缓存时不会启动
+    with make_render_executor(render_workers) as executor:
+        async for path in gen_pdf_path(pdf_dir):
+            path: Path
+            write_jsonl_append(
+                output_dir / path.with_suffix(".jsonl").name,
+                generate_jsonl_lines_from_pdf(
+                    path, prompt, model, detail, executor=executor
+                ),
+            )
@@ -48,13 +48,16 @@ def create_batch(
     return batch.id
 
 
-def wait_for_batch(batch_id: str, interval: int = 10) -> Optional[str]:
+def wait_for_batch(
+    batch_id: str, interval: int = 10, max_interval: int = 60
+) -> Optional[str]:
     """
-    轮询等待 batch 执行完成。
+    轮询等待 batch 执行完成，轮询间隔按指数退避增长。
 
     Args:
         batch_id (str): 批处理任务 ID。
-        interval (int): 轮询间隔时间（秒）。
+        interval (int): 初始轮询间隔时间（秒）。
+        max_interval (int): 轮询间隔上限（秒）。
 
     Returns:
         Optional[str]: 输出文件的 file_id，如果失败则为 None。
@@ -71,6 +74,7 @@ def wait_for_batch(batch_id: str, interval: int = 10) -> Optional[str]:
             logger.info(f"[失败] 批处理失败，状态: {status}")
             return None
         time.sleep(interval)
+        interval = min(interval * 2, max_interval)
 
 
 def download_batch_output(
@@ -1,7 +1,12 @@
-import base64
+import binascii
+import hashlib
 import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Deque, Generator, Optional, Tuple, Union
 
 import cv2
 import fitz
@@ -9,7 +14,11 @@ import numpy as np
 from aiofile import async_open
 from loguru import logger
 
-from definition.const.location import INPUT_DIR
+from definition.const.location import IMG_CACHE_DIR, INPUT_DIR
+
+# 渲染子进程各自持有的 PDF 文档对象及其路径
+_WORKER_DOC: Optional[fitz.Document] = None
+_WORKER_DOC_PATH: Optional[Path] = None
 
 
 async def gen_pdf_path(input_dir: Path = INPUT_DIR) -> AsyncGenerator[Path, None]:
@@ -37,29 +46,6 @@ async def gen_pdf_path(input_dir: Path = INPUT_DIR) -> AsyncGenerator[Path, None
                 logger.error(f"无法访问 PDF 文件 {file_path}: {e}")
 
 
-def gen_pdf_pages(pdf_path: Path) -> Generator[fitz.Page, None, None]:
-    """
-    生成 PDF 文档中的每一页。
-
-    Args:
-        pdf_path (Path): pdf_path (Path): PDF 文件路径。
-
-    Returns:
-        Generator[fitz.Page, None, None]: PDF 的单页对象的生成器。
-
-    Yields:
-        Iterator[Generator[fitz.Page, None, None]]: PDF 的单页对象可迭代对象。
-    """
-
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception as e:
-        logger.error(f"无法打开 PDF 文件: {e}")
-
-    for page_number in range(len(doc)):
-        yield doc.load_page(page_number)
-
-
 def page_to_pixmap(
     page: fitz.Page, scale: float = 1.25, gray: bool = True
 ) -> fitz.Pixmap:
@@ -79,43 +65,275 @@ def page_to_pixmap(
     return page.get_pixmap(matrix=matrix, colorspace=colorspace, alpha=False)
 
 
-def pixmap_to_base64(pix: fitz.Pixmap) -> str:
+def pixmap_to_ndarray(pix: fitz.Pixmap) -> np.ndarray:
     """
-    将 fitz.Pixmap 转换为 base64 编码的 PNG 图像（不带 data URL 前缀）。
+    将 fitz.Pixmap 以零拷贝方式视为 (H, W, C) 的 uint8 数组。
 
     Args:
         pix (fitz.Pixmap): 待转换的 fitz.Pixmap 对象。
 
-    Raises:
-        ValueError: 如果 PNG 编码失败。
-
     Returns:
-        str: base64 编码的 PNG 图像字符串。
+        np.ndarray: 引用 Pixmap 内存的图像数组，调用方需保证 pix 存活。
     """
-    image: np.ndarray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+    # samples_mv 直接引用 Pixmap 内存，避免 samples 的整页拷贝
+    return np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
         pix.height, pix.width, pix.n
     )
 
-    # 通道处理
-    if pix.n == 1:
-        image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-    elif pix.n == 4:
-        image = image[:, :, :3]
 
-    success, png_data = cv2.imencode(".png", image)
+# 空白页检测参数；检测逻辑变化时递增版本号，使缓存中的旧判定失效
+BLANK_DETECTOR_VERSION = 2
+BLANK_INK_DELTA = 16
+BLANK_MIN_INK = 1
+
+
+def is_blank_image(
+    image: np.ndarray, ink_delta: int = BLANK_INK_DELTA, min_ink: int = BLANK_MIN_INK
+) -> bool:
+    """
+    基于降采样后的像素统计快速判断页面是否为空白页。
+
+    Args:
+        image (np.ndarray): 页面图像数组。
+        ink_delta (int): 亮度与背景（中位数）相差超过该值的采样点视为有内容，
+            深色背景上的浅色文字同样计入。
+        min_ink (int): 有内容的采样点少于该数量时视为空白。
+
+    Returns:
+        bool: 是否为空白页。
+    """
+    # 彩色页先转为亮度，与灰度渲染的判定结果保持一致
+    if image.ndim == 3 and image.shape[2] >= 3:
+        image = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2GRAY)
+    # INTER_AREA 按 8x8 区域求均值，细笔画会改变所在区域的亮度而不会被跳过
+    sample = cv2.resize(image, None, fx=1 / 8, fy=1 / 8, interpolation=cv2.INTER_AREA)
+    background = int(np.median(sample))
+    deviation = np.abs(sample.astype(np.int16) - background)
+    return int(np.count_nonzero(deviation > ink_delta)) < min_ink
+
+
+def pixmap_to_base64(pix: fitz.Pixmap, quality: int = 85) -> str:
+    """
+    将 fitz.Pixmap 转换为 base64 编码的 JPEG 图像（不带 data URL 前缀）。
+
+    Args:
+        pix (fitz.Pixmap): 待转换的 fitz.Pixmap 对象。
+        quality (int): JPEG 压缩质量（0-100）。
+
+    Raises:
+        ValueError: 如果 JPEG 编码失败。
+
+    Returns:
+        str: base64 编码的 JPEG 图像字符串。
+    """
+    # pix 在本函数内始终存活，编码完成前视图有效
+    image = pixmap_to_ndarray(pix)
+
+    # 通道处理：灰度图直接以单通道编码，视觉模型可直接接受；
+    # RGB / RGBA 去除 alpha 后转为 OpenCV 所需的 BGR（一次整图拷贝）
+    if pix.n >= 3:
+        image = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2BGR)
+
+    success, jpg_data = cv2.imencode(
+        ".jpg",
+        image,
+        [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1],
+    )
     if not success:
-        raise ValueError("PNG 编码失败")
+        raise ValueError("JPEG 编码失败")
 
-    return base64.b64encode(png_data.tobytes()).decode("utf-8")
+    # 直接编码缓冲区视图，省去 tobytes 拷贝；base64 输出仅含 ASCII
+    return binascii.b2a_base64(memoryview(jpg_data), newline=False).decode("ascii")
 
 
-def make_data_url(base64_str: str, mime_type: str = "image/png") -> str:
+def page_cache_path(
+    pdf_path: Path,
+    mtime_ns: int,
+    page_idx: int,
+    scale: float = 1.25,
+    gray: bool = True,
+    quality: int = 85,
+    cache_dir: Path = IMG_CACHE_DIR,
+) -> Path:
+    """
+    计算单页编码结果的缓存文件路径，PDF 被修改、渲染参数或空白页检测变化时键随之变化。
+
+    Args:
+        pdf_path (Path): PDF 文件路径。
+        mtime_ns (int): PDF 文件的修改时间（纳秒）。
+        page_idx (int): 页码（从 0 开始）。
+        scale (float): 渲染缩放比例。
+        gray (bool): 是否使用灰度图。
+        quality (int): JPEG 压缩质量。
+        cache_dir (Path): 缓存目录。
+
+    Returns:
+        Path: 缓存文件路径。
+    """
+    key = (
+        f"{pdf_path.resolve()}|{mtime_ns}|{page_idx}|{scale}|{gray}|{quality}"
+        f"|blank-v{BLANK_DETECTOR_VERSION}-{BLANK_INK_DELTA}-{BLANK_MIN_INK}"
+    )
+    return cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.b64"
+
+
+def read_page_cache(
+    cache_file: Path, skip_blank: bool = True
+) -> Tuple[bool, Optional[str]]:
+    """
+    读取单页缓存；命中时刷新修改时间，供按最久未用淘汰。
+
+    Args:
+        cache_file (Path): 缓存文件路径（.b64），同名 .blank 文件标记空白页。
+        skip_blank (bool): 是否跳过空白页。
+
+    Returns:
+        Tuple[bool, Optional[str]]: (是否命中, base64 图像字符串，空白页为 None)。
+    """
+    # 渲染时总会检测空白页并写入标记，故 .b64 存在时 .blank 的有无即为结论
+    blank_file = cache_file.with_suffix(".blank")
+    if skip_blank and blank_file.is_file():
+        os.utime(blank_file)
+        return True, None
+    if cache_file.is_file():
+        os.utime(cache_file)
+        return True, cache_file.read_text(encoding="ascii")
+    return False, None
+
+
+def page_to_base64(
+    page: fitz.Page,
+    cache_file: Optional[Path] = None,
+    skip_blank: bool = True,
+    scale: float = 1.25,
+    gray: bool = True,
+    quality: int = 85,
+) -> Optional[str]:
+    """
+    渲染并编码单页图像；命中缓存时跳过渲染与编码。
+
+    Args:
+        page (fitz.Page): PDF 页面对象。
+        cache_file (Optional[Path]): 缓存文件路径，为 None 时不使用缓存。
+        skip_blank (bool): 是否跳过空白页。
+        scale (float): 渲染缩放比例。
+        gray (bool): 是否使用灰度图。
+        quality (int): JPEG 压缩质量。
+
+    Returns:
+        Optional[str]: base64 编码的 JPEG 图像字符串，空白页返回 None。
+    """
+    if cache_file is not None:
+        hit, cached = read_page_cache(cache_file, skip_blank)
+        if hit:
+            return cached
+
+    pix = page_to_pixmap(page, scale, gray)
+    blank = is_blank_image(pixmap_to_ndarray(pix))
+    base64_img = None if blank and skip_blank else pixmap_to_base64(pix, quality)
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        if blank:
+            cache_file.with_suffix(".blank").touch()
+        if base64_img is not None:
+            # 先写临时文件再替换，避免中断后留下残缺的缓存
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_text(base64_img, encoding="ascii")
+            tmp_file.replace(cache_file)
+
+    return base64_img
+
+
+def prune_page_cache(
+    cache_dir: Path = IMG_CACHE_DIR, size_limit: int = 20 << 30
+) -> None:
+    """
+    缓存总大小超过上限时，按修改时间从旧到新淘汰缓存条目。
+
+    Args:
+        cache_dir (Path): 缓存目录。
+        size_limit (int): 缓存总大小上限（字节）。
+    """
+    if not cache_dir.is_dir():
+        return
+
+    # 同一页的 .b64、.blank 及中断写入残留的 .tmp 作为一个条目一并淘汰
+    entries: dict = {}
+    for file in (
+        *cache_dir.glob("*.b64"),
+        *cache_dir.glob("*.blank"),
+        *cache_dir.glob("*.tmp"),
+    ):
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        mtime, size, files = entries.get(file.stem, (0, 0, []))
+        entries[file.stem] = (
+            max(mtime, stat.st_mtime_ns),
+            size + stat.st_size,
+            files + [file],
+        )
+
+    total = sum(size for _, size, _ in entries.values())
+    for _, size, files in sorted(entries.values(), key=lambda entry: entry[0]):
+        if total <= size_limit:
+            break
+        for file in files:
+            file.unlink(missing_ok=True)
+        total -= size
+
+
+def make_render_executor(max_workers: int = 4) -> ProcessPoolExecutor:
+    """
+    创建渲染页面用的进程池，供整个流程内的所有 PDF 共享。
+
+    Args:
+        max_workers (int): 渲染进程数上限，实际不超过 CPU 核数。
+
+    Returns:
+        ProcessPoolExecutor: 渲染进程池。
+    """
+    # PyMuPDF 不支持多线程使用，改用独立进程并行渲染；
+    # 以 spawn 启动，避免 fork 带有日志线程的父进程
+    return ProcessPoolExecutor(
+        max_workers=max(1, min(max_workers, os.cpu_count() or 1)),
+        mp_context=get_context("spawn"),
+    )
+
+
+def _render_page_worker(
+    pdf_path: Path, page_idx: int, cache_file: Optional[Path], skip_blank: bool
+) -> Optional[str]:
+    """
+    在渲染子进程中渲染并编码单页，同一 PDF 在每个进程内只打开一次。
+
+    Args:
+        pdf_path (Path): PDF 文件路径。
+        page_idx (int): 页码（从 0 开始）。
+        cache_file (Optional[Path]): 缓存文件路径，为 None 时不使用缓存。
+        skip_blank (bool): 是否跳过空白页。
+
+    Returns:
+        Optional[str]: base64 编码的 JPEG 图像字符串，空白页返回 None。
+    """
+    global _WORKER_DOC, _WORKER_DOC_PATH
+    if _WORKER_DOC_PATH != pdf_path:
+        if _WORKER_DOC is not None:
+            _WORKER_DOC.close()
+        _WORKER_DOC = fitz.open(pdf_path)
+        _WORKER_DOC_PATH = pdf_path
+    return page_to_base64(_WORKER_DOC.load_page(page_idx), cache_file, skip_blank)
+
+
+def make_data_url(base64_str: str, mime_type: str = "image/jpeg") -> str:
     """
     将 base64 字符串组装为 data URL 格式。
 
     Args:
         base64_str (str): base64 编码内容。
-        mime_type (str): MIME 类型，默认使用 PNG。
+        mime_type (str): MIME 类型，默认使用 JPEG。
 
     Returns:
         str: 完整的 data URL 字符串。
@@ -171,6 +389,10 @@ def generate_jsonl_lines_from_pdf(
     prompt: str,
     model: str = "gpt-4o-mini",
     detail: str = "auto",
+    skip_blank: bool = True,
+    cache_dir: Optional[Path] = IMG_CACHE_DIR,
+    executor: Optional[Executor] = None,
+    window: int = 8,
 ) -> Generator[dict, None, None]:
     """
     给定一个 PDF 文件路径，逐页生成符合 OpenAI Batch API JSONL 格式的请求行。
@@ -180,22 +402,77 @@ def generate_jsonl_lines_from_pdf(
         prompt (str): 用户输入的文字 prompt。
         model (str, optional): 具体模型 Defaults to "gpt-4o-mini".
         detail (str, optional): 需要模型了解的细节程度 Defaults to "auto".
+        skip_blank (bool, optional): 是否跳过空白页 Defaults to True.
+        cache_dir (Optional[Path], optional): 页面图像缓存目录，为 None 时不缓存 Defaults to IMG_CACHE_DIR.
+        executor (Optional[Executor], optional): 渲染进程池，为 None 时在当前进程内逐页渲染 Defaults to None.
+        window (int, optional): 同时在途的最大页数 Defaults to 8.
 
     Yields:
         Generator[dict, None, None]: 符合 OpenAI Batch API JSONL 格式的请求行。
     """
-    for idx, page in enumerate(gen_pdf_pages(pdf_path)):
-        pix = page_to_pixmap(page)
-        base64_img = pixmap_to_base64(pix)
-        data_url = make_data_url(base64_img)
-        custom_id = f"{pdf_path.stem}-page-{idx + 1:04d}"
-        yield make_vision_jsonl_line(
-            image_data_url=data_url,
-            prompt=prompt,
-            custom_id=custom_id,
-            model=model,
-            detail=detail,
-        )
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        logger.error(f"无法打开 PDF 文件: {e}")
+        return
+
+    mtime_ns = pdf_path.stat().st_mtime_ns
+    # 按页序排列的在途结果：缓存命中或本进程渲染的结果，或渲染进程的 Future
+    pending: Deque[Tuple[int, Union[Future, Optional[str]]]] = deque()
+
+    def drain(limit: int) -> Generator[dict, None, None]:
+        while len(pending) > limit:
+            idx, result = pending.popleft()
+            base64_img = result.result() if isinstance(result, Future) else result
+            if base64_img is None:
+                logger.debug(f"跳过空白页: {pdf_path.name} 第 {idx + 1} 页")
+                continue
+            yield make_vision_jsonl_line(
+                image_data_url=make_data_url(base64_img),
+                prompt=prompt,
+                custom_id=f"{pdf_path.stem}-page-{idx + 1:04d}",
+                model=model,
+                detail=detail,
+            )
+
+    try:
+        for idx in range(doc.page_count):
+            cache_file = (
+                page_cache_path(pdf_path, mtime_ns, idx, cache_dir=cache_dir)
+                if cache_dir is not None
+                else None
+            )
+            # 先在本进程查缓存，仅将未命中的页交给渲染进程
+            hit, base64_img = (
+                read_page_cache(cache_file, skip_blank)
+                if cache_file is not None
+                else (False, None)
+            )
+            if hit:
+                pending.append((idx, base64_img))
+            elif executor is None:
+                page = doc.load_page(idx)
+                pending.append((idx, page_to_base64(page, cache_file, skip_blank)))
+            else:
+                pending.append(
+                    (
+                        idx,
+                        executor.submit(
+                            _render_page_worker, pdf_path, idx, cache_file, skip_blank
+                        ),
+                    )
+                )
+            yield from drain(window)
+        yield from drain(0)
+    finally:
+        # 消费方提前中止时取消尚未开始的渲染任务
+        for _, result in pending:
+            if isinstance(result, Future):
+                result.cancel()
+        doc.close()
+
+    if cache_dir is not None:
+        prune_page_cache(cache_dir)
 
 
 def write_jsonl_append(
@@ -209,6 +486,6 @@ def write_jsonl_append(
         jsonl_generator (Generator[dict, None, None]): JSONL 数据生成器。
     """
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with file_path.open("a", encoding="utf-8") as f:
+    with file_path.open("a", encoding="utf-8", buffering=1 << 20) as f:
         for item in jsonl_generator:
             f.write(json.dumps(item, ensure_ascii=False) + "\n")
@@ -54,7 +54,7 @@ def decode_openai_jsonl(input_path: Path, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with input_path.open("r", encoding="utf-8") as f_in, output_path.open(
-        "w", encoding="utf-8"
+        "w", encoding="utf-8", buffering=1 << 20
     ) as f_out:
         for line in f_in:
             record: dict = json.loads(line)  # 自动处理转义
@@ -68,8 +68,7 @@ def decode_openai_jsonl(input_path: Path, output_path: Path) -> None:
                             text_blocks.append(chunk.get("text", ""))
             markdown_text = "\n".join(text_blocks)
 
-            f_out.write(f"<!-- {custom_id} -->\n")
-            f_out.write(markdown_text + "\n\n")
+            f_out.write(f"<!-- {custom_id} -->\n{markdown_text}\n\n")
 
     print(f"✅ 已保存 Markdown 文本至 {output_path}")
 